@@ -43,8 +43,9 @@ def coords_len(coords: dict):
     return [len(v) for v in coords.values()]
 
 def make_xr(coords, fill):
+    # Zero-stride read-only view, copy explicitly where the array is written.
     return xr.DataArray(
-        np.full(coords_len(coords), fill, dtype=float),
+        np.broadcast_to(np.float64(fill), coords_len(coords)),
         dims=tuple(coords.keys()),
         coords=coords
     )
@@ -71,7 +72,7 @@ def test_combine_sparse():
         x=["a", "b", "c", "d"],
         y=[-1, 0, 1, 2, 3])
 
-    expected = make_xr(coords, np.nan)
+    expected = make_xr(coords, np.nan).copy()
     expected.loc[coords_0] = 0.0
     expected.loc[coords_1] = 1.0
     print_ar("ar2", ar2)
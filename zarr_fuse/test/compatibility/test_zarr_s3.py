@@ -3,6 +3,7 @@ import warnings
 
 import fsspec
 import numpy as np
+import pytest
 import zarr
 from zarr.errors import ZarrUserWarning
 
@@ -57,6 +58,7 @@ def _cleanup_store(config, path):
     fs.rm(path, recursive=True)
 
 
+@pytest.mark.s3
 def test_fsspec_store_s3_roundtrip(secret_getenv):
     config = _s3_test_config(secret_getenv)
     store_path = (
@@ -6,6 +6,8 @@ import zarr
 script_dir = Path(__file__).parent
 workdir = script_dir / "workdir"
 
+# Seeded for reproducibility, shared so that successive datasets still differ.
+rng = np.random.default_rng(0)
 
 
 def make_ds(coords_, ds=None):
@@ -23,7 +25,7 @@ def make_ds(coords_, ds=None):
         for d, coord in coords_.items()
     }
     shape = tuple(len(c) for c in coords.values())
-    data = np.random.rand(*shape)
+    data = rng.standard_normal(shape, dtype=np.float32)
     return xr.Dataset(
         {"temp": (tuple(coords.keys()), data)},
         coords=coords
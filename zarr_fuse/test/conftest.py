@@ -14,9 +14,7 @@ def _repo_secret_env_files() -> list[Path]:
     ]
 
 
-@pytest.fixture(scope="session")
-def load_repo_secret_env() -> Path | None:
-    """Load repo-local secret environment variables for tests when available."""
+def _load_repo_secret_env() -> Path | None:
     for env_file in _repo_secret_env_files():
         if env_file.exists():
             load_dotenv(env_file, override=False)
@@ -24,6 +22,44 @@ def load_repo_secret_env() -> Path | None:
     return None
 
 
+def _s3_skip_reason() -> str | None:
+    """
+    Reason to skip the S3 tests, None if they can run.
+    Credentials (ZF_S3_ACCESS_KEY, ZF_S3_SECRET_KEY) are looked up in the environment
+    after loading the same sources the S3 tests use: the nearest `.env` file
+    (`load_dotenv()` in the tests) and the repository `.secrets_env`.
+    Variables already set in the environment take precedence.
+    """
+    load_dotenv()
+    _load_repo_secret_env()
+    missing = [name for name in ("ZF_S3_ACCESS_KEY", "ZF_S3_SECRET_KEY") if not os.getenv(name)]
+    if missing:
+        return f"missing S3 credentials: {', '.join(missing)}"
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip tests marked `s3` up front if the S3 credentials are not available,
+    instead of failing every one of them on its first S3 request.
+    """
+    s3_items = [item for item in items if "s3" in item.keywords]
+    if not s3_items:
+        return
+    reason = _s3_skip_reason()
+    if reason is None:
+        return
+    skip_s3 = pytest.mark.skip(reason=reason)
+    for item in s3_items:
+        item.add_marker(skip_s3)
+
+
+@pytest.fixture(scope="session")
+def load_repo_secret_env() -> Path | None:
+    """Load repo-local secret environment variables for tests when available."""
+    return _load_repo_secret_env()
+
+
 @pytest.fixture
 def secret_getenv(load_repo_secret_env):
     """Return a strict environment lookup helper for secret-backed tests."""
@@ -124,6 +124,7 @@ def _cleanup_store(creds, store_path):
         pass
 
 
+@pytest.mark.s3
 def test_read_s3_zarr_store_via_zarr_fuse_api(secret_getenv):
     """Test writing and reading zarr data to/from S3 using zarr_fuse's native API.
     
@@ -210,6 +211,7 @@ def test_read_s3_zarr_store_via_zarr_fuse_api(secret_getenv):
     print("\n✓ Test PASSED - Successfully wrote to and read from S3 using zarr_fuse API!")
 
 
+@pytest.mark.s3
 def test_write_with_pure_zarr_read_with_zarr_fuse(secret_getenv):
     """Test writing with pure zarr (no xarray) and reading with zarr_fuse.
     
@@ -311,6 +313,7 @@ def test_write_with_pure_zarr_read_with_zarr_fuse(secret_getenv):
         raise
 
 
+@pytest.mark.s3
 def test_read_existing_s3_store(secret_getenv):
     """Test reading an existing production zarr store from S3 (hlavo-release bucket).
     
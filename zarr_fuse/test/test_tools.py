@@ -1,5 +1,6 @@
 import numpy as np
 import copy
+import sys
 from zarr_fuse.tools import adjust_grid, recursive_update
 
 
@@ -57,6 +58,10 @@ def test_adjust_grid():
     except ImportError:
         pass
 
+    # Close points are dropped, long steps split evenly.
+    grid = adjust_grid(np.array([4.0, 0.0, 0.1, 1.0]), (0.5, 1.0))
+    np.testing.assert_allclose(grid, [0.0, 1.0, 2.0, 3.0, 4.0])
+
 
 
 def test_recursive_update():
@@ -100,3 +105,14 @@ def test_recursive_update():
     b = {"a": {"b": {"d": 999, "e": 3}}}
     recursive_update(a, b)
     assert a == {"a": {"b": {"c": 1, "d": 999, "e": 3}}}
+
+    # --- Nesting deeper than the recursion limit ---
+    depth = 2 * sys.getrecursionlimit()
+    a, b = {}, {}
+    a_leaf, b_leaf = a, b
+    for _ in range(depth):
+        a_leaf = a_leaf.setdefault("n", {})
+        b_leaf = b_leaf.setdefault("n", {})
+    a_leaf["old"], b_leaf["new"] = 1, 2
+    recursive_update(a, b)
+    assert a_leaf == {"old": 1, "new": 2}
@@ -445,7 +445,7 @@ def test_variable_logging_and_basics():
     v, _ = _mk_var({"name": "v", "coords": []})
     assert hasattr(v, "unit") and hasattr(v, "description") and hasattr(v, "df_col") and hasattr(v, "source_unit")
     za = v.zarr_attrs()
-    assert {"unit", "description", "df_col", "source_unit"}.issubset(set(za.keys()))
+    assert {"unit", "description", "df_col", "source_unit"} <= za.keys()
 
     # warning path through logger
     v, log = _mk_var({"name": "v", "coords": []})
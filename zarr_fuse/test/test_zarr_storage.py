@@ -2,7 +2,10 @@ from typing import *
 import shutil
 import time
 import os
+import json
+import re
 import copy
+from collections import deque
 from dotenv import load_dotenv
 
 
@@ -15,6 +18,7 @@ import pytest
 import zarr
 import time
 import fsspec
+import yaml
 
 from zarr.storage import FsspecStore
 
@@ -28,7 +32,23 @@ logging.basicConfig(level=logging.INFO)
 
 script_dir = Path(__file__).parent
 inputs_dir = script_dir / "inputs"
-workdir = script_dir / "workdir"
+
+
+@pytest.fixture(scope="session")
+def load_schema():
+    """
+    Session wide schema loader, parses every input YAML only once.
+    Each call returns a fresh NodeSchema, so tests are free to modify it.
+    """
+    raw_schemas = {}
+
+    def _load(fname):
+        struc_path = inputs_dir / fname
+        if fname not in raw_schemas:
+            raw_schemas[fname] = yaml.safe_load(struc_path.read_text(encoding="utf-8")) or {}
+        return zf.schema.deserialize(raw_schemas[fname], source_description=str(struc_path))
+
+    return _load
 
 
 # async def get_items(store):
@@ -57,14 +77,8 @@ def _store_ls(schema, **kwargs):
     options = zf.zarr_storage._zarr_fuse_options(node_schema, **kwargs)
     store = zf.zarr_storage._zarr_store_open(options)
     if not isinstance(store, FsspecStore):
-        # Handle Windows path properly - remove file:// protocol and normalize
-        store_path_str = str(store)
-        if store_path_str.startswith("file://"):
-            store_path_str = store_path_str[7:]  # Remove file://
-        elif store_path_str.startswith("file:"):
-            store_path_str = store_path_str[5:]  # Remove file:
-        path = Path(store_path_str).parent # folder above the zarr store
-        return os.listdir(path)
+        # LocalStore keeps its root as a Path, no need to parse the 'file://' URL (Windows safe).
+        return os.listdir(store.root.parent) # folder above the zarr store
     else:
         loop = fsspec.asyn.get_loop()                     # fsspec’s global loop
         sess = fsspec.asyn.sync(loop, store.fs.set_session)   # ensure s3 client is made on that loop
@@ -79,9 +93,11 @@ def _store_ls(schema, **kwargs):
 
 @pytest.mark.parametrize("options",[
     {"STORE_URL":"open_store_tst.zarr", "WORKDIR":"to_be_overwritten_by_schema"},
-    {"STORE_URL":"s3://test-zarr-storage/open_store_tst.zarr", "S3_ENDPOINT_URL": "to_be_overwritten_by_schema"}
+    pytest.param(
+        {"STORE_URL":"s3://test-zarr-storage/open_store_tst.zarr", "S3_ENDPOINT_URL": "to_be_overwritten_by_schema"},
+        marks=pytest.mark.s3),
 ])
-def test_open_store(smart_tmp_path, options):
+def test_open_store(smart_tmp_path, options, load_schema):
     """
     Single test function, parametrized by (schema_file, options_dict) pairs:
 
@@ -99,7 +115,7 @@ def test_open_store(smart_tmp_path, options):
       * Creates/deletes a key directly in the store mapping (bypassing Node API).
     """
     load_dotenv()
-    schema = zf.schema.deserialize(inputs_dir / "schema_open_store_tst.yaml")
+    schema = load_schema("schema_open_store_tst.yaml")
     schema.ds.ATTRS['WORKDIR'] = str(smart_tmp_path)
     zf.remove_store(schema, **options)
     print("AFTER REMOVAL: ", _store_ls(schema, **options))  # Should be empty
@@ -113,8 +129,8 @@ def test_open_store(smart_tmp_path, options):
 
 
 @pytest.mark.parametrize("logger_option", ['default', None])
-def test_open_store_default_logger_behavior(monkeypatch, logger_option):
-    schema = zf.schema.deserialize(inputs_dir / "schema_open_store_tst.yaml")
+def test_open_store_default_logger_behavior(monkeypatch, logger_option, load_schema):
+    schema = load_schema("schema_open_store_tst.yaml")
     captured = {}
     sentinel_store = object()
 
@@ -135,8 +151,8 @@ def test_open_store_default_logger_behavior(monkeypatch, logger_option):
     assert node["kwargs"]["logger"] is None
 
 
-def test_open_store_local_logger(monkeypatch):
-    schema = zf.schema.deserialize(inputs_dir / "schema_open_store_tst.yaml")
+def test_open_store_local_logger(monkeypatch, load_schema):
+    schema = load_schema("schema_open_store_tst.yaml")
     captured = {}
     sentinel_store = object()
 
@@ -222,9 +238,9 @@ def test_datetime_encoding_roundtrip(smart_tmp_path):
     npt.assert_array_equal(reopened["temperature"].values, np.array([280.0, 281.0]))
 
 
-def test_merge_ds_unsorted(smart_tmp_path):
-    store_path = smart_tmp_path / "sparse_borehole_region.zarr"
-    shutil.rmtree(store_path, ignore_errors=True)
+def test_merge_ds_unsorted():
+    # Persistence is covered elsewhere, keep the chunks in memory.
+    store = zarr.storage.MemoryStore()
     schema_dict = {
         "VARS": {
             "temperature": {
@@ -248,12 +264,9 @@ def test_merge_ds_unsorted(smart_tmp_path):
                 "chunk_size": 2,
             },
         },
-        "ATTRS": {
-            "STORE_URL": str(store_path),
-        },
     }
 
-    node = zf.open_store(schema_dict)
+    node = zf.Node("", store, new_schema=zf.schema.deserialize(schema_dict))
     node.update(pl.DataFrame({
         "timestamp": [
             "1970-01-01T00:00:00+00:00",
@@ -264,7 +277,7 @@ def test_merge_ds_unsorted(smart_tmp_path):
         "temp": [10.0, 11.0, 12.0],
     }))
 
-    node = zf.open_store(schema_dict)
+    node = zf.Node("", store, new_schema=zf.schema.deserialize(schema_dict))
     node.update(pl.DataFrame({
         "timestamp": [
             "1970-01-01T00:00:00+00:00",
@@ -275,8 +288,8 @@ def test_merge_ds_unsorted(smart_tmp_path):
     }))
 
 
-def test_update_from_ds_writes_schema_compatible_dataset():
-    schema = zf.schema.deserialize(inputs_dir / "schema_open_store_tst.yaml")
+def test_update_from_ds_writes_schema_compatible_dataset(load_schema):
+    schema = load_schema("schema_open_store_tst.yaml")
 
     class DummyNode:
         _validate_ds_against_schema = zf.Node._validate_ds_against_schema
@@ -336,73 +349,80 @@ def test_update_from_ds_writes_schema_compatible_dataset():
         node.update_from_ds(ds_bad_coord_values)
 
 
-def sync_remove_store(storage_options, path):
-    so = storage_options.copy()
-    so['asynchronous'] = False  # Ensure synchronous operation
-    fs = fsspec.filesystem('s3', **so)
-    try:
-        fs.rm(path, recursive=True, maxdepth=None)
-    except FileNotFoundError:
-        pass
-
-def sync_list_dirs(storage_options, root_path):
-    so = storage_options.copy()
-    so['asynchronous'] = False
-    fs = fsspec.filesystem('s3', **so)
-    directories = []
-
-    def _list_dirs(path):
-        try:
-            entries = fs.ls(path, detail=True)
-        except FileNotFoundError:
-            return
-        for entry in entries:
-            # For s3fs, entry['type'] is 'directory' for dirs, 'file' for files
-            if entry.get('type') == 'directory':
-                directories.append(entry['name'])
-                _list_dirs(entry['name'])
-
-    _list_dirs(root_path)
-    return directories
-
-
 """
 This is an inital test of xarray, zarr functionality that we build on.
 This requires dask.
 """
+# Upper bound of coordinate chunks in the weather test stores, the test datasets have just a few items.
+# Full size chunks (up to 1024 x 512 in schema_weather.yaml) would be padded and compressed on every write.
+TEST_CHUNK_SIZE = 16
+TEST_S3_ENDPOINT_URL = "https://s3.cl4.du.cesnet.cz"
+# Every tox environment writes under its own prefix, every test to its own sub-prefix in it.
+TEST_S3_ROOT = f"s3://test-zarr-storage/{os.environ.get('TOX_ENV_NAME', 'local')}"
+
+
+def _clamp_chunk_size(node_schema: zf.zarr_schema.NodeSchema, max_size: int):
+    for coord in node_schema.ds.COORDS.values():
+        coord.chunk_size = min(coord.chunk_size, max_size)
+    for child in node_schema.groups.values():
+        _clamp_chunk_size(child, max_size)
+
+
 @report
-def aux_read_struc(fname, storage_type="local"):
-    struc_path = inputs_dir / fname
-    schema = zf.schema.deserialize(struc_path)
-    kwargs =  {"WORKDIR": str(workdir), "S3_ENDPOINT_URL": "https://s3.cl4.du.cesnet.cz"}
+def aux_read_struc(load_schema, fname, work_dir: Path, storage_type="local", test_name: str | None = None,
+                   max_chunk_size: int | None = None):
+    """
+    Open a new store for the schema `fname`.
+    Local stores are created in the per test `work_dir` (pytest `tmp_path`), which is empty,
+    so nothing has to be removed and tests can run in parallel (pytest-xdist).
+    S3 stores are created under a prefix made of the full `test_name` (pytest `request.node.name`).
+    If `max_chunk_size` is given, the coordinate chunk sizes of the returned schema are capped at it,
+    so the store is written with the capped sizes, not those of the YAML file.
+    """
+    schema = load_schema(fname)
+    if max_chunk_size is not None:
+        _clamp_chunk_size(schema, max_chunk_size)
+    kwargs =  {"WORKDIR": str(work_dir), "S3_ENDPOINT_URL": TEST_S3_ENDPOINT_URL}
     if storage_type == "s3":
-        # Use open_storage with S3 schema - UNIQUE PATH!
-        tox_env_name = os.environ.get("TOX_ENV_NAME", "local")
+        # Unique path per test: the test name includes its parameters and, unlike the `work_dir` name,
+        # is not truncated, so only the store of this test is removed, other stores under TEST_S3_ROOT
+        # are left untouched. Characters other than word characters, '.' and '-' (e.g. the brackets
+        # of parameters, glob patterns for fsspec) are replaced.
+        prefix = re.sub(r"[^\w.-]", "_", test_name)
         store_name = Path(fname).with_suffix(".zarr")
-        store_url = f"s3://test-zarr-storage/{tox_env_name}/{store_name}"
-        kwargs['STORE_URL'] = str(store_url)
+        kwargs['STORE_URL'] = f"{TEST_S3_ROOT}/{prefix}/{store_name}"
+        # The test store is only modified through its own filesystem instance, which invalidates
+        # the listings it writes to, so keep the listings cached for the whole test.
+        kwargs['S3_OPTIONS'] = json.dumps({"listings_expiry_time": 60})
+        zf.remove_store(schema, **kwargs)
     else:
-
         # Local storage logic
-        store_path = (workdir / fname).with_suffix(".zarr")
-        #if store_path.exists():
-        #    shutil.rmtree(store_path)
+        store_path = (work_dir / fname).with_suffix(".zarr")
         kwargs['STORE_URL'] = str(store_path)
-    zf.remove_store(schema, **kwargs)
     node = zf.open_store(schema, **kwargs)
     return schema, node.store, node
 
-# Recursively update each node with its corresponding data.
-def _update_tree(node: zf.Node, df_map: dict):
-    if node.group_path in df_map:
-        #print(f"Updating node {node.group_path}.")
-        #assert (Path(node.store.root) / node.group_path).exists()
+def _iter_nodes(tree: zf.Node) -> Iterator[zf.Node]:
+    """Yield every node of the tree exactly once, breadth first."""
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        yield node
+        queue.extend(child for _, child in node.items())
+
+
+# Update each node of the tree with its corresponding data.
+def _update_tree(tree: zf.Node, df_map: dict):
+    updated = [node for node in _iter_nodes(tree) if node.group_path in df_map]
+    # Sequential on purpose, concurrent updates would interleave the writes to the shared store log.
+    for node in updated:
         node.update(df_map[node.group_path])
-        assert len(node.dataset.coords) == 1
-        assert len(node.dataset.data_vars) == 1
 
-    for key, child in node.items():
-        _update_tree(child, df_map)
+    # Validate only the updated nodes, once all writes are done.
+    for node in updated:
+        ds = node.dataset
+        assert len(ds.coords) == 1
+        assert len(ds.data_vars) == 1
 
 
 @report
@@ -418,14 +438,10 @@ def _create_test_data():
 def _run_full_test(tree, df_map):
     """Run comprehensive test with full tree traversal."""
     _update_tree(tree, df_map)
-    #print(f"[TIMING] _update_tree: {time.time() - t1:.2f}s")
-    #t2 = time.time()
 
     # V3 doesn't have consolidated data support yet (only as undocumented)
     # we can not use it for parallel writes anyway.
     #zarr.consolidate_metadata(tree.store)
-    #print(f"[TIMING] consolidate_metadata: {time.time() - t2:.2f}s")
-    #print(f"[TIMING] test_node_tree TOTAL: {time.time() - start_time:.2f}s")
 
 
 
@@ -435,46 +451,27 @@ def _run_local_validation(tree, df_map):
     """Run additional validation steps for local storage."""
     _run_full_test(tree, df_map)
 
-    @report
-    def collect_nodes(node, nodes_dict):
-        nodes_dict[node.group_path] = node
-        for key, child in node.items():
-            collect_nodes(child, nodes_dict)
-        return nodes_dict
-
-    #t3 = time.time()
-    root_node = zf.Node.read_store(tree.store)
-    nodes = collect_nodes(root_node, {})
-    #print(f"[TIMING] read_store + collect_nodes: {time.time() - t3:.2f}s")
-
-    #t4 = time.time()
-    expected = {
-        key: (df['time'].to_numpy(), df['temperature'].to_numpy())
-        for key, df in df_map.items()
-    }
-    for node_name, (exp_time, exp_temp) in expected.items():
-        ds = nodes[node_name].dataset
-        np.testing.assert_array_equal(ds.coords["time"].values, exp_time)
-        np.testing.assert_array_equal(ds["temperature"].values, exp_temp)
-    #print(f"[TIMING] assertions: {time.time() - t4:.2f}s")
+    # Reuse the already open store handle, consolidate so the re-read needs a single metadata read.
+    zarr.consolidate_metadata(tree.store)
+    root_node = zf.Node.read_store(tree.store, consolidated=True)
+    nodes = {node.group_path: node for node in _iter_nodes(root_node)}
+
+    # Compare node by node, so a failed assertion names the node.
+    for key, df in df_map.items():
+        ds = nodes[key].dataset
+        np.testing.assert_array_equal(ds.coords["time"].values, df['time'].to_numpy(), err_msg=key)
+        np.testing.assert_array_equal(ds["temperature"].values, df['temperature'].to_numpy(), err_msg=key)
 
     assert set(root_node.children.keys()) == {"child_1", "child_2"}
     assert set(root_node.children["child_1"].children.keys()) == {"child_3"}
 
 
-@pytest.mark.parametrize("storage_type", ["local", "s3"])
-def test_node_tree(storage_type, load_repo_secret_env):
-    #import time
-    #start = time.time()
-    #print(f"[TIMING] test_node_tree({storage_type}) START")
-    
-    #t0 = time.time()
-    schema, store, tree = aux_read_struc("schema_tree.yaml", storage_type=storage_type)
+@pytest.mark.parametrize("storage_type", ["local", pytest.param("s3", marks=pytest.mark.s3)])
+def test_node_tree(request, tmp_path, storage_type, load_repo_secret_env, load_schema):
+    schema, store, tree = aux_read_struc(load_schema, "schema_tree.yaml", tmp_path,
+                                         storage_type=storage_type, test_name=request.node.name)
     assert tree.schema == schema.ds
     assert tree['child_1'].schema == schema.groups['child_1'].ds
-    #print(f"[TIMING] aux_read_struc: {time.time() - t0:.2f}s")
-    
-    #t1 = time.time()
     df_map = _create_test_data()
     
     if storage_type == "s3":
@@ -483,26 +480,105 @@ def test_node_tree(storage_type, load_repo_secret_env):
         _run_local_validation(tree, df_map)
 
 
-def _check_ds_attrs_weather(ds, schema_ds):
+def test_read_store_consolidated_is_read_only(tmp_path, load_schema):
+    schema, store, tree = aux_read_struc(load_schema, "schema_tree.yaml", tmp_path)
+    tree.update(pl.DataFrame({"time": [1000], "temperature": [280.0]}))
+    zarr.consolidate_metadata(store)
+    snapshot = zf.Node.read_store(store, consolidated=True)
+    # A write would drop the consolidated metadata the snapshot reads from.
+    with pytest.raises(ValueError, match="read-only"):
+        snapshot.update(pl.DataFrame({"time": [1001], "temperature": [281.0]}))
+    with pytest.raises(ValueError, match="read-only"):
+        snapshot["child_1"].update(pl.DataFrame({"time": [1001], "temperature": [281.0]}))
+    np.testing.assert_array_equal(snapshot.dataset["temperature"].values, [280.0])
+
+
+def _composed_keys(*cols) -> np.ndarray:
+    """
+    Index keys of a composed coordinate for whole source columns in one pass.
+    Must reproduce the tuple `hash` applied by `zarr_storage.coerce_df` on ingest.
+    """
+    return np.fromiter(map(hash, zip(*cols)), dtype=np.int64, count=len(cols[0]))
+
+
+def _check_ds_attrs_weather(ds, yaml_ds):
     # Check that the dataset has the expected attributes.
     assert "description" in ds.attrs
     assert "__structure__" in ds.attrs
-    for key, coord in schema_ds.COORDS.items():
-        assert key in ds.coords
-        assert ds.coords[key].attrs['composed'] == coord.composed
-        assert ds.coords[key].attrs['chunk_size'] == coord.chunk_size
+    coords = yaml_ds.COORDS
+    # Attributes read from the raw variables, no DataArray is constructed.
+    variables, ds_coords, ds_vars = ds.variables, set(ds.coords), set(ds.data_vars)
+    # `yaml_ds` is the schema as read from schema_weather.yaml, the weather stores
+    # are written with its chunk sizes capped at TEST_CHUNK_SIZE.
+    expected = {
+        key: (coord.composed, min(coord.chunk_size, TEST_CHUNK_SIZE))
+        for key, coord in coords.items()
+    }
+    got = {
+        key: (variables[key].attrs.get('composed'), variables[key].attrs.get('chunk_size'))
+        for key in coords if key in ds_coords
+    }
+    assert got == expected
+    for key, coord in coords.items():
         if len(coord.composed) > 1:
-            assert ds.coords[key].dtype == 'int64'
-            for sub_coord in coord.composed:
-                assert sub_coord in ds.data_vars
-                assert sub_coord not in ds.coords
-
-@pytest.mark.parametrize("storage_type", ["local", "s3"])
-def test_update_weather(tmp_path, storage_type, load_repo_secret_env):
+            assert variables[key].dtype == 'int64'
+            assert set(coord.composed) <= ds_vars
+            assert not set(coord.composed) & ds_coords
+
+# Input time stamps of test_update_weather, t1 < t3 < t2 < t3_5 < t4.
+WEATHER_T1 = "2025-05-13T07:00:00Z"
+WEATHER_T2 = "2025-05-13T09:00:00Z"
+WEATHER_T3 = "2025-05-13T8:00:00Z"
+WEATHER_T3_5 = "2025-05-13T20:00:00Z"
+WEATHER_T4 = "2025-05-14T8:00:00Z"
+# Reference UTC instants of [t1, t2, t3_5, t4], the final 'time of year' coordinate.
+# Written in canonical ISO form, numpy does not parse the single digit hours of the inputs.
+REF_TIMES_NS = np.array(
+    ["2025-05-13T07:00", "2025-05-13T09:00", "2025-05-13T20:00", "2025-05-14T08:00"],
+    dtype="datetime64[ns]")
+REF_TIMES_HOUR = REF_TIMES_NS.astype("datetime64[h]")
+
+# Explicit column types of the weather input frames, Polars skips type inference.
+_WEATHER_DF_SCHEMA = pl.Schema({
+    "timestamp": pl.String,
+    "latitude": pl.Float64,
+    "longitude": pl.Float64,
+    "temp": pl.Float64,
+})
+
+# Input frames of the two test_update_weather updates.
+WEATHER_DF_1 = pl.DataFrame({
+    "timestamp": [WEATHER_T1] * 3 + [WEATHER_T2] * 3,
+    "latitude": [10.0, 20.0, 20.0, 10.0, 20.0, 20.0],
+    "longitude": [10.0, 10.0, 20.0, 10.0, 10.0, 20.0],
+    "temp": [280.0, 281.0, 282.0, 283.0, 284.0, 285.0]
+}, schema=_WEATHER_DF_SCHEMA)
+WEATHER_DF_2 = pl.DataFrame({
+    "timestamp": [WEATHER_T4] * 3 + [WEATHER_T3] * 3,  #  t1 < t3 < t2 < t4
+    "latitude": [20.0, 10.0, 20.0, 10.0, 20.0, 20.0],
+    "longitude": [10.0, 10.0, 20.0, 10.0, 20.0, 10.0],
+    "temp": [381.0, 380.0, 382.0, 383.0, 385.0, 384.0]
+}, schema=_WEATHER_DF_SCHEMA)
+
+
+def _check_temperature_weather(ds, time_coord, df):
+    # Compare stored temperatures with the source rows, all rows in a single pointwise lookup.
+    lat_lon_keys = _composed_keys(df["latitude"].to_list(), df["longitude"].to_list())
+    times = time_coord.convert_values(df["timestamp"].to_numpy())
+    new_temp = ds["temperature"].sel({
+        "time of year": xr.DataArray(times, dims="p"),
+        "lat_lon": xr.DataArray(lat_lon_keys, dims="p"),
+    }).values
+    np.testing.assert_allclose(new_temp, df["temp"].to_numpy() + 273.15)
+
+
+@pytest.mark.parametrize("storage_type", ["local", pytest.param("s3", marks=pytest.mark.s3)])
+def test_update_weather(request, tmp_path, storage_type, load_repo_secret_env, load_schema):
     # Example YAML file content (as a string for illustration):
-    import pandas as pd
-
-    schema, store, tree = aux_read_struc("schema_weather.yaml", storage_type=storage_type)
+    schema, store, tree = aux_read_struc(load_schema, "schema_weather.yaml", tmp_path,
+                                         storage_type=storage_type, test_name=request.node.name,
+                                         max_chunk_size=TEST_CHUNK_SIZE)
+    yaml_ds = load_schema("schema_weather.yaml").ds
     ds_schema = schema.ds
     assert len(ds_schema.COORDS) == 2
     assert len(ds_schema.VARS) == 3
@@ -529,36 +605,19 @@ def test_update_weather(tmp_path, storage_type, load_repo_secret_env):
     # Create a Polars DataFrame with 6 temperature readings.
     # Two time stamps (e.g. 1000 and 2000 seconds) and three latitude values (e.g. 10.0, 20.0, 30.0).
     # These are input time stemps in CET timezone. Going to be stored in UTC.
-    t1 = "2025-05-13T07:00:00Z"
-    t2 = "2025-05-13T09:00:00Z"
-    t3 = "2025-05-13T8:00:00Z"
-    t3_5 = "2025-05-13T20:00:00Z"
-    t4 = "2025-05-14T8:00:00Z"
-
-    df = pl.DataFrame({
-        "timestamp": [t1, t1, t1, t2, t2, t2],
-        "latitude": [10.0, 20.0, 20.0, 10.0, 20.0, 20.0],
-        "longitude": [10.0, 10.0, 20.0, 10.0, 10.0, 20.0],
-        "temp": [280.0, 281.0, 282.0, 283.0, 284.0, 285.0]
-    })
+    t1, t2, t3, t3_5, t4 = WEATHER_T1, WEATHER_T2, WEATHER_T3, WEATHER_T3_5, WEATHER_T4
+
+    df = WEATHER_DF_1
     @report
     def update(df):
         tree.update(df)
         return tree.dataset
 
     # Update the dataset atomically using the Polars DataFrame.
-    updated_ds = update(df)
-    _check_ds_attrs_weather(updated_ds, ds_schema)
-
-    # Now, re-read the entire Zarr storage from scratch.
-    @report
-    def reread(store):
-        new_tree = zf.Node.read_store(store)
-        new_ds = new_tree.dataset
-        return new_ds
-
-    new_ds = reread(store)
-    _check_ds_attrs_weather(new_ds, ds_schema)
+    # The returned dataset is already read back from the store,
+    # the whole tree is re-read from scratch only after the last update.
+    new_ds = update(df)
+    _check_ds_attrs_weather(new_ds, yaml_ds)
     print("Updated dataset:")
     print(new_ds)
 
@@ -569,49 +628,41 @@ def test_update_weather(tmp_path, storage_type, load_repo_secret_env):
     # Check the shape of the temperature variable.
     assert new_ds["temperature"].shape == (2,3)     #(3, 3)
 
-    source_dt_unit = tree.schema.COORDS["time of year"].source_unit
+    # Node.schema re-reads the stored structure on every access, look it up once.
+    time_coord = tree.schema.COORDS["time of year"]
+    source_dt_unit = time_coord.source_unit
     parsed_cet = np.array([source_dt_unit.parse(t1), source_dt_unit.parse(t2)], dtype="datetime64[h]")
-    expected_utc_values = pd.to_datetime([t1, t2]).values
-    ref_cet = expected_utc_values.astype("datetime64[h]") + np.timedelta64(1, "h")
-    np.testing.assert_array_equal(parsed_cet, ref_cet)
+    np.testing.assert_array_equal(parsed_cet, REF_TIMES_HOUR[:2] + np.timedelta64(1, "h"))
 
     # The schema parses these inputs through a fixed CET source timezone.
     # For explicit "...Z" timestamps, storage should still end up at the same UTC instants.
-    ref_vec = expected_utc_values.astype("datetime64[h]")
-    np.testing.assert_array_equal(pd.Series(ref_vec).values, expected_utc_values.astype("datetime64[h]"))
-    np.testing.assert_array_equal(new_ds["time of year"].values, ref_vec)
+    np.testing.assert_array_equal(new_ds["time of year"].values, REF_TIMES_HOUR[:2])
 
     # Check that the "lat" coordinate was updated to [10.0, 20.0, 30.0]
     np.testing.assert_array_equal(new_ds["latitude"].values, [20.0, 20.0, 10.0])
-    out_unit = zf.units.DateTimeUnit(tick='h', tz="UTC", dayfirst=False, yearfirst=True)
-    for row in df.iter_rows(named=True):
-        time_str_array = np.array([row["timestamp"]])
-        time = tree.schema.COORDS["time of year"].convert_values(time_str_array)[0]
-        lat = row["latitude"]
-        lon = row["longitude"]
-        new_temp = new_ds["temperature"].sel({"time of year":time, "lat_lon":hash((lat, lon))})
-        ref_temp_K = row["temp"] + 273.15
-        assert  new_temp.values == np.array(ref_temp_K)
+    _check_temperature_weather(new_ds, time_coord, df)
 
     # Second update, test merging
-    df2 = pl.DataFrame({
-        "timestamp": [t4, t4, t4, t3, t3, t3],  #  t1 < t3 < t2 < t4
-        "latitude": [20.0, 10.0, 20.0, 10.0, 20.0, 20.0],
-        "longitude": [10.0, 10.0, 20.0, 10.0, 20.0, 10.0],
-        "temp": [381.0, 380.0, 382.0, 383.0, 385.0, 384.0]
-    })
+    df2 = WEATHER_DF_2
 
     # Update the dataset atomically using the Polars DataFrame.
-    update(df2)
-    updated_ds = tree.dataset
+    updated_ds = update(df2)
 
     # Time t3 is only used to interpolate to t2, not added to the dataset.
     assert updated_ds.sizes == {'time of year':4, 'lat_lon':3}  #[26, 3]
-    _check_ds_attrs_weather(updated_ds, ds_schema)
+    _check_ds_attrs_weather(updated_ds, yaml_ds)
 
     # Now, re-read the entire Zarr storage from scratch.
+    # Consolidate first, so the read-only snapshot needs a single metadata read.
+    @report
+    def reread(store):
+        zarr.consolidate_metadata(store)
+        new_tree = zf.Node.read_store(store, consolidated=True)
+        new_ds = new_tree.dataset
+        return new_ds
+
     new_ds = reread(store)
-    _check_ds_attrs_weather(new_ds, ds_schema)
+    _check_ds_attrs_weather(new_ds, yaml_ds)
     print("Updated dataset:")
     print(new_ds)
 
@@ -628,39 +679,54 @@ def test_update_weather(tmp_path, storage_type, load_repo_secret_env):
         [source_dt_unit.parse(ts) for ts in [t1, t2, t3_5, t4]],
         dtype="datetime64[ns]",
     )
-    ref_cet = (
-        pd.to_datetime([t1, t2, t3_5, t4]).values.astype("datetime64[ns]")
-        + np.timedelta64(1, "h")
-    )
-    np.testing.assert_array_equal(parsed_cet, ref_cet)
+    np.testing.assert_array_equal(parsed_cet, REF_TIMES_NS + np.timedelta64(1, "h"))
 
-    times_pd = pd.to_datetime([t1, t2, t3_5, t4])
-    ref_times = times_pd.values.astype("datetime64[ns]")
-    np.testing.assert_array_equal(new_ds["time of year"].values, ref_times)
+    np.testing.assert_array_equal(new_ds["time of year"].values, REF_TIMES_NS)
     # !! Wrong order, not sorted
 
     # Check that the "lat" coordinate was updated to [10.0, 20.0, 30.0]
     np.testing.assert_array_equal(new_ds["latitude"].values, [20.0, 20.0, 10.0])
     np.testing.assert_array_equal(new_ds["longitude"].values, [20.0, 10.0, 10.0])
-
-
-def test_update_tensors(tmp_path):
-    schema, store, tree = aux_read_struc("schema_tensors.yaml")
+    # Rows at the new time t4 are stored as they are.
+    _check_temperature_weather(new_ds, time_coord, df2.filter(pl.col("timestamp") == t4))
+
+
+@pytest.mark.parametrize("storage_type", ["local", pytest.param("s3", marks=pytest.mark.s3)])
+def test_update_weather_batched(request, tmp_path, storage_type, load_repo_secret_env, load_schema):
+    # Both frames of test_update_weather in a single update, a single metadata read and region write.
+    # Merging into existing data is covered by test_update_weather, here all rows are new,
+    # so t3 is stored as it is instead of being interpolated to t2.
+    schema, store, tree = aux_read_struc(load_schema, "schema_weather.yaml", tmp_path,
+                                         storage_type=storage_type, test_name=request.node.name,
+                                         max_chunk_size=TEST_CHUNK_SIZE)
+    df = pl.concat([WEATHER_DF_1, WEATHER_DF_2])
+    tree.update(df)
+
+    ds = tree.dataset
+    _check_ds_attrs_weather(ds, load_schema("schema_weather.yaml").ds)
+    assert ds.sizes == {'time of year': 4, 'lat_lon': 3}
+    # t1 < t3 < t2 < t4
+    ref_times = np.array(
+        ["2025-05-13T07:00", "2025-05-13T08:00", "2025-05-13T09:00", "2025-05-14T08:00"],
+        dtype="datetime64[ns]")
+    np.testing.assert_array_equal(ds["time of year"].values, ref_times)
+    _check_temperature_weather(ds, tree.schema.COORDS["time of year"], df)
+
+
+def test_update_tensors(tmp_path, load_schema):
+    # Open a store with three coordinates, one of them discrete ('tn_voigt_3d'),
+    # the schema written to the store must be read back unchanged.
+    schema, store, tree = aux_read_struc(load_schema, "schema_tensors.yaml", tmp_path)
     ds_schema = schema.ds
     assert len(ds_schema.COORDS) == 3
     assert len(ds_schema.VARS) == 2
-    print("Coordinates:")
-    for coord in ds_schema.COORDS:
-        print(coord)
-    print("\nQuantities:")
-    for var in ds_schema.VARS:
-        print(var)
+    assert "__structure__" in tree.dataset.attrs
+    assert zf.Node.read_store(store).schema == ds_schema
 
 
 
 def test_node_read_df():
-    # Create an in‑memory Zarr store (a dict works as a Zarr store)
-    store = {}
+    # Pure in-memory test of Node._read_df, no Zarr store is involved.
 
     # Create a simple dataset with one coordinate ("time") and one variable ("temperature").
     # We use 5 time points with increasing temperature values.
@@ -726,22 +792,6 @@ def update_zarr_store(zarr_path: str, ds_update: xr.Dataset) -> None:
 
 
 
-@pytest.fixture
-def sample_df():
-    # Create a sample Polars DataFrame with multi-index columns: time_stamp and location,
-    # plus two data columns: var1 and var2.
-    location = [(1.,2.), (3., 4.0), (5., 6.0), (1., 3.)]
-    loc_x, loc_y = zip(*location)
-    loc_struct = pl.DataFrame(dict(x=loc_x, y=loc_y)).to_struct()
-    df = pl.DataFrame({
-        "time_stamp": [1, 2, 3, 4],
-        "location": loc_struct,
-        "sensor": ["A", "B", "C", "A"],
-        "var1": [0.0, 0.0, 0.0, 0.0],
-        "var2": [0, 0, 0, 0]
-    })
-    return df
-
 class DummyLogger:
     def debug(self, *a, **k): pass
     def info(self, *a, **k): pass
@@ -753,9 +803,7 @@ class TestPivotND:
     lat_lon = [(50.0, 14.0), (51.0, 15.0)]
 
     def composed(self, vars):
-        tuple_list = zip(*vars)
-        hash_list = [hash(tuple(t)) for t in tuple_list]
-        return np.array(hash_list, dtype=np.int64).tolist()
+        return _composed_keys(*(list(v) for v in vars)).tolist()
 
     def check_temp(self, ds, ref_mat):
         da_lat_lon = self.composed((ds['latitude'].values, ds['longitude'].values))
@@ -776,8 +824,8 @@ class TestPivotND:
         self.check_temp(ds_all, ref_mat)
         return ds_all
 
-    def test_pivot_nd_weather(self):
-        schema = zf.schema.deserialize(Path(inputs_dir/"schema_weather.yaml")).ds
+    def test_pivot_nd_weather(self, load_schema):
+        schema = load_schema("schema_weather.yaml").ds
         self.schema = schema
         self.logger = DummyLogger()
 
@@ -889,9 +937,9 @@ class TestPivotND:
 #     np.testing.assert_allclose(arr, expected_arr, equal_nan=True)
 
 @pytest.mark.skip
-def test_update_dense():
+def test_update_dense(tmp_path, load_schema):
     # Example YAML file content (as a string for illustration):
-    schema, store, tree = aux_read_struc("schema_transport.yaml")
+    schema, store, tree = aux_read_struc(load_schema, "schema_transport.yaml", tmp_path)
     assert '__structure__' in tree.dataset.attrs
     childs = [key for key, _ in tree._storage_group_paths()]
     assert childs == ["run_XYZ"]
@@ -910,8 +958,8 @@ def test_update_dense():
     qmc = np.arange(8, dtype=np.int64)
     param_name = ["mesh_seed", "edz_seed", "source"]
 
-    int_to_bits = lambda x: ((x >> np.arange(2, -1, -1)) & 1).astype(bool)
-    A_sample = [int_to_bits(q) for q in qmc]
+    # Bits of every qmc index at once, shape (qmc, param_name), most significant bit first.
+    A_sample = ((qmc[:, None] >> np.arange(2, -1, -1)) & 1).astype(bool)
     node.update_dense(dict(qmc=qmc, param_name=param_name, A_sample=A_sample))
     # TODO:
     # First write does just partial coords initialization
@@ -962,12 +1010,14 @@ def test_update_dense():
     ))
     assert '__structure__' in node.dataset.attrs
 
-    root_group = zarr.open_group(store, path="", mode='r')
+    # Consolidate once, the checks and the re-read below then need a single metadata read.
+    zarr.consolidate_metadata(store)
+    root_group = zarr.open_group(store, path="", mode='r', use_consolidated=True)
     sub_groups = [k for k, g in root_group.groups()]
     assert sub_groups == ["run_XYZ"]
 
     # Now, re-read the entire Zarr storage from scratch.
-    new_tree = zf.Node.read_store(store)
+    new_tree = zf.Node.read_store(store, consolidated=True)
     new_ds = new_tree["run_XYZ"].dataset
 
     #np.testing.assert_array_equal(new_ds["time of year"].values, ref_times)
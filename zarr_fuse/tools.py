@@ -14,22 +14,30 @@ def adjust_grid(x:np.ndarray, step_range:np.array) -> np.ndarray:
     min_step, max_step = step_range
     if x.ndim != 1:
         raise ValueError("`x` must be 1D")
-    xs = np.unique(x)  # sort & remove duplicates
+    # Sort & remove duplicates, coordinate grids are usually strictly increasing already.
+    xs = x.copy() if np.all(np.diff(x) > 0) else np.unique(x)
+    # Drop points closer than `min_step` to the last kept point.
+    # Sequential by nature, the loop only runs if some step is actually too small.
+    if not np.all(np.diff(xs) >= min_step):
+        keep = np.zeros(len(xs), dtype=bool)
+        keep[0] = True
+        last = xs[0]
+        for i in range(1, len(xs)):
+            if xs[i] - last >= min_step:
+                keep[i] = True
+                last = xs[i]
+        xs = xs[keep]
 
-    out = [xs[0]]
-    last = xs[0]
-    for xi in xs[1:]:
-        d = xi - last
-        if d < min_step:
-            continue
-        if d > max_step:
-            n = int(np.ceil(d / max_step))
-            step = d / n
-            for k in range(1, n):
-                out.append(last + k * step)
-        out.append(xi)
-        last = xi
-    return np.array(out)
+    # Split every step into `n` equal substeps, n > 1 only for steps > max_step.
+    d = np.diff(xs)
+    n = np.maximum(np.ceil(d / max_step).astype(np.int64), 1)
+    if np.all(n == 1):
+        return xs
+    # Substep index k = 0 .. n-1 of every output point within its step.
+    starts = np.cumsum(n) - n
+    k = np.arange(n.sum()) - np.repeat(starts, n)
+    inserted = np.repeat(xs[:-1], n) + k * np.repeat(d / n, n)
+    return np.concatenate([inserted, xs[-1:]])
 
 
 def recursive_update(d, u):
@@ -39,11 +47,16 @@ def recursive_update(d, u):
     If both d[k] and u[k] are dicts, merge them recursively.
     Otherwise, overwrite d[k] with u[k].
     """
-    for k, v in u.items():
-        if isinstance(v, dict) and isinstance(d.get(k), dict):
-            recursive_update(d[k], v)
-        else:
-            d[k] = v
+    # Explicit stack of (target, update) pairs, no recursion limit on deep nesting.
+    stack = [(d, u)]
+    while stack:
+        target, update = stack.pop()
+        for k, v in update.items():
+            target_v = target.get(k)
+            if isinstance(v, dict) and isinstance(target_v, dict):
+                stack.append((target_v, v))
+            else:
+                target[k] = v
     return d
 
 
@@ -1,5 +1,5 @@
 import re
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import Iterable, Any
 
 import numpy as np
@@ -118,6 +118,33 @@ class Quantity(ureg.Quantity):
         # pint.Quantity.units has unlogical name.
         return self.units
 
+@lru_cache(maxsize=None)
+def _resolve_tzinfo(val: str | None) -> datetime.tzinfo:
+    """
+    Convert a DateTimeUnit timezone spec into a tzinfo instance.
+    Cached per spec, repeated specs skip the offset regex, TZINFOS and gettz lookups.
+    """
+    if val is None:
+        return datetime.timezone.utc
+
+    # offset form ±HH:MM
+    m = re.match(r'([+-])(\d{2}):(\d{2})$', val)
+    if m:
+        sign = 1 if m.group(1) == '+' else -1
+        hours, mins = int(m.group(2)), int(m.group(3))
+        offset = datetime.timedelta(hours=hours, minutes=mins) * sign
+        return datetime.timezone(offset)
+
+    if val in TZINFOS:
+        return TZINFOS[val]
+
+    # named zone
+    tzinfo = dateutil.tz.gettz(val)
+    if tzinfo is None:
+        raise ValueError(f"Unknown timezone spec '{val}'")
+    return tzinfo
+
+
 @attrs.define
 class DateTimeUnit:
     """
@@ -130,40 +157,18 @@ class DateTimeUnit:
     yearfirst: bool = True
 
     @property
-    def tzinfo(self) -> datetime.tzinfo | None:
+    def tzinfo(self) -> datetime.tzinfo:
         """
         Lazily convert the stored zone‐name/_offset string into a tzinfo instance.
         Accepts None, '+HH:MM' or '-HH:MM', or named zones.
         """
-        val = self.tz
-        if val is None:
-            return datetime.timezone.utc
-
-        # offset form ±HH:MM
-        m = re.match(r'([+-])(\d{2}):(\d{2})$', val)
-        if m:
-            sign = 1 if m.group(1) == '+' else -1
-            hours, mins = int(m.group(2)), int(m.group(3))
-            offset = datetime.timedelta(hours=hours, minutes=mins) * sign
-            return datetime.timezone(offset)
-
-        if val in TZINFOS:
-            return TZINFOS[val]
-
-        # named zone
-        tzinfo = dateutil.tz.gettz(val)
-        if tzinfo is None:
-            raise ValueError(f"Unknown timezone spec '{val}'")
-        return tzinfo
+        return _resolve_tzinfo(self.tz)
 
     @property
     def tz_shift(self) -> float:
         """Hours offset from UTC for this unit's timezone."""
-        tzinfo = self.tzinfo
-        if tzinfo is None:
-            return 0.0
         reference = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
-        offset = tzinfo.utcoffset(reference)
+        offset = self.tzinfo.utcoffset(reference)
         if offset is None:
             return 0.0
         return offset.total_seconds() / 3600.0
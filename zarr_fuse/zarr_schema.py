@@ -414,7 +414,7 @@ Attrs = Dict[str, Any]
 attrs_field = attrs.field
 # Overcome the name conflict within DatasetSchema class.
 
-reserved_keys = set(["ATTRS", "COORDS", "VARS"])
+reserved_keys = frozenset({"ATTRS", "COORDS", "VARS"})
 
 @attrs.define
 class DatasetSchema(AddressMixin):
@@ -545,7 +545,7 @@ class NodeSchema(AddressMixin):
         Custom asdict to override ds and groups serialization.
         """
         children_dict = value_serializer(self, "", self.groups)
-        assert set(children_dict.keys()).isdisjoint(reserved_keys)
+        assert children_dict.keys().isdisjoint(reserved_keys)
 
         ds_dict = value_serializer(self, "", self.ds)
         children_dict.update(ds_dict)
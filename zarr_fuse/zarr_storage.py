@@ -127,6 +127,10 @@ def _s3_options(store_options):
             #'read_timeout': 60,
             'request_checksum_calculation': 'when_required',
             'response_checksum_validation': 'when_required',
+            # Concurrent chunk requests share one pool of kept alive connections,
+            # the botocore default of 10 connections serializes larger batches.
+            'max_pool_connections': 32,
+            'connector_args': {'keepalive_timeout': 60},
         }
     }
     custom_options_json = _get_option(store_options, 'S3_OPTIONS', default='{}')
@@ -320,19 +324,24 @@ class Node:
 
 
     @classmethod
-    def read_store(cls, zarr_store):
+    def read_store(cls, zarr_store, consolidated: bool = False):
         """
         Reconstruct the tree from a single Zarr store.
 
         Parameters:
           storage_url (str): The URL or path to the Zarr storage.
+          consolidated (bool): Read groups and datasets through the consolidated metadata
+            of the root group, written by `zarr.consolidate_metadata(zarr_store)`.
+            Saves per-group listings and metadata reads (one GET instead of many on S3),
+            but the consolidated metadata is a snapshot, so it is only valid until the next write.
+            The tree is then read-only, updates raise ValueError.
 
         Returns:
           Node: The root node of the reconstructed tree.
 
         Assumes that the root node is stored at the root group (i.e. with group path "").
         """
-        root = cls("", store=zarr_store)
+        root = cls("", store=zarr_store, consolidated=consolidated)
         return root
 
 
@@ -445,17 +454,21 @@ class Node:
     def __init__(self, name, store, parent=None,
                  new_schema:zarr_schema.NodeSchema=None,
                  mode="a",
-                 logger=None):
+                 logger=None,
+                 consolidated: bool = False):
         """
         Parameters:
           name (str): The name of the node. For the root node, use an empty string ("").
           store (MutableMapping): The underlying Zarr store.
           parent (Node, optional): Parent node.
+          consolidated (bool): Read the storage through the consolidated metadata, see `read_store`.
         """
         self.name = name
         self.store = store
         self._logger = logger
-        if store.read_only:
+        self.consolidated = consolidated
+        if store.read_only or consolidated:
+            # A write would replace the root metadata and drop the consolidated snapshot.
             mode = 'r'
         else:
             # Make sure group exists.
@@ -491,8 +504,13 @@ class Node:
         TODO: rename to '_read_subgroups'
         """
         path = self.group_path.strip(self.PATH_SEP)
-        root_group = zarr.open_group(self.store, path=path, mode='r')
-        sub_groups = list(root_group.groups())
+        if self.consolidated:
+            # Consolidated metadata lives only in the root group, navigate from there.
+            root_group = zarr.open_group(self.store, mode='r', use_consolidated=True)
+            group = root_group[path] if path else root_group
+        else:
+            group = zarr.open_group(self.store, path=path, mode='r')
+        sub_groups = list(group.groups())
         return sub_groups
 
     # def _add_node(self, name):
@@ -525,7 +543,7 @@ class Node:
 
         self._update_schema_ds(new_node_schema.ds)
 
-        child_node_names = set([key for key, _ in self._storage_group_paths()])
+        child_node_names = {key for key, _ in self._storage_group_paths()}
         child_node_names.update(new_node_schema.groups.keys())
 
         def make_child(key):
@@ -543,6 +561,7 @@ class Node:
                 parent=self,
                 new_schema=new_child_schema,
                 logger=self.logger,
+                consolidated=self.consolidated,
             )
 
         # Process existing child Nodes
@@ -624,7 +643,7 @@ class Node:
         """
         rel_path = self.group_path #+ self.PATH_SEP + "dataset"
         rel_path = rel_path.strip(self.PATH_SEP)
-        ds = xr.open_zarr(self.store, group=rel_path, consolidated=False)
+        ds = xr.open_zarr(self.store, group=rel_path, consolidated=self.consolidated)
         # TODO: Check why this is used and if it is necessary.
         # for coord in ds.coords:
         #     assert 'composed' in ds.coords[coord].attrs
@@ -911,6 +930,10 @@ class Node:
 
         3. write extended / interpolated parts (Phase 2)
         """
+        if self.consolidated:
+            raise ValueError(
+                f"Node '{self.group_path}' is read through consolidated metadata and is read-only, "
+                f"open the store without `consolidated` to update it.")
         ds_existing = self.dataset
 
         # --- Phase 1: Dive (split by dimension) ---
@@ -1194,8 +1217,8 @@ def coerce_df(schema: zarr_schema.DatasetSchema,
     1. Coerce all variable columns from df into 1D numpy arrays (no masking yet).
     2. Coerce all coord columns (including composed coords) into data_vars,
        then build coordinate arrays per dimension.
-    3. Compute per-row integer indices into each coord axis, and a valid_rows
-       mask (rows with valid coords).
+    3. Factorize each coord axis into sorted unique values and per-row integer
+       indices (np.unique with return_inverse), after dropping rows with invalid coords.
     4. Build df_multi_idx (tuple of index arrays) for valid rows and apply
        valid_rows to variable columns.
     5. Build final coords_dict via Node._create_coords.
@@ -1222,11 +1245,10 @@ def coerce_df(schema: zarr_schema.DatasetSchema,
     valid_rows = np.ones(len(df), dtype=bool)
     for k, c in schema.COORDS.items():
         if (c.composed is not None) and (len(c.composed) > 1):
-            # hash tuple coords
+            # hash tuple coords, filled directly into the int64 array without an intermediate list
             tuple_list = zip(*(data_vars[comp] for comp in c.composed))
             coord_valid_rows = np.all([schema.VARS[comp].valid_mask(data_vars[comp]) for comp in c.composed], axis=0)
-            hash_list = [hash(tuple(t)) for t in tuple_list]
-            data_vars[k] = np.array(hash_list, dtype=np.int64)
+            data_vars[k] = np.fromiter(map(hash, tuple_list), dtype=np.int64, count=len(df))
         else:
             # mix vars and coord to be backward compatible with remaining code
             col = get_df_col(df, c, logger)
@@ -1246,12 +1268,9 @@ def coerce_df(schema: zarr_schema.DatasetSchema,
     #valid_rows = np.ones(n_rows, dtype=bool)
 
     for d in dims:
-        df_coord_array = data_vars[d]
-        coords = np.unique(df_coord_array)
-        coords = np.sort(coords)
-
+        # Factorize: sorted unique coords and the integer code of every row.
+        coords, final_idx = np.unique(data_vars[d], return_inverse=True)
         coords_dict_raw[d] = coords
-        final_idx = np.searchsorted(coords, df_coord_array)
         idx_list.append(final_idx)
 
     # Multi-index: one index array per dim, but only for valid rows